@@ -0,0 +1,59 @@
+# Per-board pin map and timings for the H2O rocket exhibit.
+from collections import namedtuple
+from micropython import const
+
+# Pin assignments as const() so references compile to inline ints.
+_GREEN_LED_PIN = const(16)
+_BLUE_LED_PIN = const(17)
+_RED_LED_PIN = const(18)
+_GREEN_BUTTON_PIN = const(20)
+_BLUE_BUTTON_PIN = const(21)
+_RED_BUTTON_PIN = const(22)
+_BUBBLE_VALVE_RELAY_PIN = const(13)
+_TRANSFER_VALVE_RELAY_PIN = const(12)
+_FIRE_VALVE_RELAY_PIN = const(11)
+_ENCODER_PIN = const(15)
+
+Config = namedtuple("Config", (
+    # LED pins
+    "green_led_pin",
+    "blue_led_pin",
+    "red_led_pin",
+    # Button pins
+    "green_button_pin",
+    "blue_button_pin",
+    "red_button_pin",
+    # Relay pins
+    "bubble_valve_relay_pin",
+    "transfer_valve_relay_pin",
+    "fire_valve_relay_pin",
+    # Encoder pin
+    "encoder_pin",
+    # Timings (seconds)
+    "bubble_sleep",
+    "transfer_sleep",
+    "fire_duration",
+    "timeout_duration",
+    "cooldown_duration",
+    # Misc
+    "rotation_count_to_start",
+))
+
+CFG = Config(
+    green_led_pin=_GREEN_LED_PIN,
+    blue_led_pin=_BLUE_LED_PIN,
+    red_led_pin=_RED_LED_PIN,
+    green_button_pin=_GREEN_BUTTON_PIN,
+    blue_button_pin=_BLUE_BUTTON_PIN,
+    red_button_pin=_RED_BUTTON_PIN,
+    bubble_valve_relay_pin=_BUBBLE_VALVE_RELAY_PIN,
+    transfer_valve_relay_pin=_TRANSFER_VALVE_RELAY_PIN,
+    fire_valve_relay_pin=_FIRE_VALVE_RELAY_PIN,
+    encoder_pin=_ENCODER_PIN,
+    bubble_sleep=20,
+    transfer_sleep=4,
+    fire_duration=1.5,
+    timeout_duration=30,
+    cooldown_duration=30,
+    rotation_count_to_start=1,
+)
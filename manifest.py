@@ -0,0 +1,6 @@
+# Freeze manifest: build rocket/ into the firmware so its bytecode
+# executes from flash (XIP) instead of occupying heap RAM.
+#
+# Usage: make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=/path/to/manifest.py
+include("$(PORT_DIR)/boards/manifest.py")
+package("rocket", base_path=".")
@@ -0,0 +1 @@
+# H2O rocket exhibit package.
@@ -0,0 +1,376 @@
+from machine import Pin, Timer, lightsleep, mem32
+import array
+import gc
+import sys
+import time
+import micropython
+from micropython import const
+import rp2
+
+# Allocate emergency exception buffer
+micropython.alloc_emergency_exception_buf(100)
+
+# Set True to trace relay switching on the console.
+DEBUG = False
+
+# Half-period of the "press me" LED blink.
+_BLINK_HALF_PERIOD_MS = const(500)
+
+# How often interruptible_sleep runs a garbage collection.
+_GC_INTERVAL_MS = const(500)
+
+# Rotation events the encoder can hold before the main loop drains them.
+_EVENT_BUF_SIZE = const(8)
+
+# Bytes of status messages held before flush_log writes them out.
+_LOG_BUF_SIZE = const(512)
+
+# RP2040 NVIC interrupt priority registers and the PIO IRQ lines that
+# rp2.StateMachine routes its irq() callbacks through.
+_NVIC_IPR_BASE = const(0xE000E400)
+
+# RP2040 SIO register that clears GPIO outputs: one 32-bit store turns
+# off every pin whose bit is set in the written mask.
+_SIO_GPIO_OUT_CLR = const(0xD0000018)
+_PIO0_IRQ_0 = const(7)
+_PIO1_IRQ_0 = const(9)
+
+_log_buf = bytearray(_LOG_BUF_SIZE)
+_log_len = 0
+
+def log(msg):
+    """Queue a status line; flush_log writes it to the console later.
+
+    Keeps the slow synchronous UART write out of the sequence's critical
+    path — the wait loops flush the buffer during their idle time.
+    """
+    global _log_len
+    b = msg.encode()
+    n = len(b) + 1
+    if _log_len + n > _LOG_BUF_SIZE:
+        flush_log()
+        if n > _LOG_BUF_SIZE:
+            print(msg)
+            return
+    _log_buf[_log_len:_log_len + len(b)] = b
+    _log_len += len(b)
+    _log_buf[_log_len] = 0x0A  # newline
+    _log_len += 1
+
+def flush_log():
+    global _log_len
+    if _log_len:
+        sys.stdout.write(memoryview(_log_buf)[:_log_len])
+        _log_len = 0
+
+class Button:
+    def __init__(self, button_pin, led_pin, debounce_time=25):
+        self.button = Pin(button_pin, Pin.IN, Pin.PULL_DOWN)
+        self.led = Pin(led_pin, Pin.OUT)
+        self._debounce_ms = int(debounce_time)
+        self._first_high = 0  # ticks_ms of the first raw HIGH, 0 = idle
+        # Bound-method caches: one direct call instead of two attribute
+        # lookups on every poll.
+        self._read = self.button.value
+        self._led_value = self.led.value
+        self._timer = None
+
+    def is_pressed(self):
+        # Non-blocking debounce: report a press only once the pin has been
+        # held high for the full debounce window.
+        v = self._read()
+        now = time.ticks_ms()
+        if not v:
+            self._first_high = 0
+            return False
+        if self._first_high == 0:
+            self._first_high = now
+            return False
+        return time.ticks_diff(now, self._first_high) >= self._debounce_ms
+
+    def start_blink(self, period_ms=_BLINK_HALF_PERIOD_MS):
+        # Blink on a hardware timer so the caller's poll loop never sleeps
+        # for the LED's sake.
+        led_value = self._led_value
+        self._timer = Timer(-1)
+        self._timer.init(period=period_ms, mode=Timer.PERIODIC,
+                         callback=lambda t: led_value(not led_value()))
+
+    def stop_blink(self):
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+        self.led.off()
+
+@rp2.asm_pio()
+def _count_edges():
+    # Raise an IRQ once per full low->high transition on the input pin.
+    wrap_target()
+    wait(0, pin, 0)
+    wait(1, pin, 0)
+    irq(rel(0))
+    wrap()
+
+class Encoder:
+    def __init__(self, encoder_pin, pulses_per_rotation=2, sm_id=0, sm_freq=2000):
+        """
+        :param encoder_pin: GPIO pin connected to the encoder
+        :param pulses_per_rotation: Number of pulses per rotation
+        :param sm_id: PIO state machine to use for edge counting
+        :param sm_freq: State machine clock in Hz; pulses shorter than one
+                        clock period are never sampled, so a low clock
+                        doubles as the debounce filter
+        """
+        self.encoder = Pin(encoder_pin, Pin.IN, Pin.PULL_DOWN)
+        self.pulses_per_rotation = pulses_per_rotation
+        self.pulse_count = 0
+        # Ring buffer of completed rotations; the ISR schedules _enqueue
+        # and the main loop drains via is_activated, so back-to-back
+        # rotations are queued rather than collapsed into one flag.
+        self._events = array.array('B', [0] * _EVENT_BUF_SIZE)
+        self._head = 0
+        self._tail = 0
+        # Pre-allocate the bound method passed to micropython.schedule:
+        # evaluating self._enqueue inside the handler would allocate a
+        # fresh bound-method object, which the heap lock forbids there.
+        self._enqueue_ref = self._enqueue
+        self.sm = rp2.StateMachine(sm_id, _count_edges, freq=sm_freq, in_base=self.encoder)
+        # hard=True runs the handler straight from the NVIC vector instead
+        # of the soft scheduler; the heap is locked while it runs, so the
+        # handler must stick to int arithmetic and pre-allocated objects.
+        self.sm.irq(self._sm_handler, hard=True)
+        # Raise the PIO IRQ to NVIC priority 0 (highest) so the systick /
+        # soft-timer handlers can never delay pulse counting; they keep
+        # their default, lower priority.
+        irqn = _PIO0_IRQ_0 if sm_id < 4 else _PIO1_IRQ_0
+        addr = _NVIC_IPR_BASE + (irqn & ~3)
+        mem32[addr] = mem32[addr] & ~(0xFF << ((irqn & 3) * 8))
+        self.sm.active(1)
+
+    @micropython.native
+    def _sm_handler(self, sm):
+        c = self.pulse_count + 1
+        if c >= self.pulses_per_rotation:
+            self.pulse_count = 0
+            try:
+                micropython.schedule(self._enqueue_ref, 0)
+            except RuntimeError:
+                pass  # schedule queue full; drop rather than crash the ISR
+        else:
+            self.pulse_count = c
+
+    def _enqueue(self, _):
+        nxt = (self._head + 1) % _EVENT_BUF_SIZE
+        if nxt != self._tail:
+            self._events[self._head] = 1
+            self._head = nxt
+
+    def is_activated(self):
+        if self._tail != self._head:
+            self._tail = (self._tail + 1) % _EVENT_BUF_SIZE
+            return True
+        return False
+
+    def disable(self):
+        self.sm.active(0)
+
+    def enable(self):
+        self.sm.restart()
+        self.sm.active(1)
+
+class Relay:
+    def __init__(self, relay_pin):
+        self.relay_pin = relay_pin
+        self.relay = Pin(relay_pin, Pin.OUT)
+        # Format the trace messages once so toggling never allocates.
+        self._on_msg = "Relay on pin %d turned ON." % relay_pin
+        self._off_msg = "Relay on pin %d turned OFF." % relay_pin
+        self.turn_off()
+
+    def turn_on(self):
+        self.relay.on()
+        if DEBUG:
+            print(self._on_msg)
+
+    def turn_off(self):
+        self.relay.off()
+        if DEBUG:
+            print(self._off_msg)
+
+    # Context-manager protocol: `with relay:` energizes on entry and
+    # guarantees de-energizing on exit, so an on/off pair can never be
+    # mistyped or skipped by an early return.
+    def __enter__(self):
+        self.turn_on()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.turn_off()
+        return False
+
+def interruptible_sleep(seconds, abort_button=None):
+    """Wait for `seconds`, polling `abort_button` the whole time.
+
+    Returns False if the abort button was pressed before the time
+    elapsed, True otherwise. A garbage collection runs every
+    _GC_INTERVAL_MS so collections happen here, in dead time, rather
+    than landing in a latency-sensitive spot later.
+    """
+    deadline = time.ticks_add(time.ticks_ms(), int(seconds * 1000))
+    next_gc = time.ticks_add(time.ticks_ms(), _GC_INTERVAL_MS)
+    while time.ticks_diff(deadline, time.ticks_ms()) > 0:
+        if abort_button is not None and abort_button.is_pressed():
+            return False
+        now = time.ticks_ms()
+        if time.ticks_diff(next_gc, now) <= 0:
+            gc.collect()
+            next_gc = time.ticks_add(now, _GC_INTERVAL_MS)
+        flush_log()
+        time.sleep_ms(10)
+    return True
+
+def generate_fuel(bubble_valve, duration, abort_button=None):
+    log("Generating fuel: Activating bubble valve.")
+    with bubble_valve:
+        completed = interruptible_sleep(duration, abort_button)
+    if completed:
+        log("Fuel generation completed.")
+    return completed
+
+def transfer_fuel(transfer_valve, duration, abort_button=None):
+    log("Transferring fuel: Turning on transfer valve.")
+    with transfer_valve:
+        completed = interruptible_sleep(duration, abort_button)
+    if completed:
+        log("Fuel transfer completed.")
+    return completed
+
+def fire_rocket(fire_valve, duration):
+    log("Firing rocket: Turning on fire valve.")
+    with fire_valve:
+        time.sleep(duration)
+    log("Rocket fired.")
+
+def wait_for_button_press(button, timeout):
+    deadline = time.ticks_add(time.ticks_ms(), int(timeout * 1000))
+    button.start_blink()
+    while time.ticks_diff(deadline, time.ticks_ms()) > 0:
+        if button.is_pressed():
+            button.stop_blink()
+            button.led.on()
+            log("Button pressed.")
+            return True
+        flush_log()
+        time.sleep_ms(2)
+    button.stop_blink()
+    log("Timeout waiting for button press.")
+    return False
+
+def leds_off(mask):
+    # Single SIO store clears the whole LED group at once.
+    mem32[_SIO_GPIO_OUT_CLR] = mask
+
+def run_sequence(cfg):
+    # Initialize Buttons
+    blue_button = Button(cfg.blue_button_pin, cfg.blue_led_pin)
+    green_button = Button(cfg.green_button_pin, cfg.green_led_pin)
+    red_button = Button(cfg.red_button_pin, cfg.red_led_pin)
+
+    # Initialize Encoder
+    encoder = Encoder(cfg.encoder_pin, pulses_per_rotation=(cfg.rotation_count_to_start * 2))
+
+    # Initialize Relays
+    bubble_valve_relay = Relay(cfg.bubble_valve_relay_pin)
+    transfer_valve_relay = Relay(cfg.transfer_valve_relay_pin)
+    fire_valve_relay = Relay(cfg.fire_valve_relay_pin)
+
+    # LED group is fixed for the life of the program; build its mask once.
+    led_mask = ((1 << cfg.blue_led_pin) | (1 << cfg.green_led_pin)
+                | (1 << cfg.red_led_pin))
+
+    # Turn off all LEDs initially
+    leds_off(led_mask)
+
+    # Reset encoder pulse count
+    encoder.pulse_count = 0
+
+    while True:
+        if encoder.is_activated():
+            # Disable encoder to prevent counting during sequence
+            encoder.disable()
+            log("Activation signal received. Starting sequence.")
+
+            # Generate Fuel (red button aborts mid-fill)
+            if not generate_fuel(bubble_valve_relay, cfg.bubble_sleep, abort_button=red_button):
+                log("Emergency stop during fuel generation. Resetting system.")
+                transfer_fuel(transfer_valve_relay, cfg.transfer_sleep)
+                leds_off(led_mask)
+                encoder.pulse_count = 0
+                log("Aborting sequence.")
+                encoder.enable()  # Re-enable encoder
+                continue
+
+            # Wait for Green Button Press
+            log("Waiting for green button press...")
+            if not wait_for_button_press(green_button, cfg.timeout_duration):
+                log("Green button not pressed in time. Resetting system.")
+                transfer_fuel(transfer_valve_relay, cfg.transfer_sleep)
+                leds_off(led_mask)
+                encoder.pulse_count = 0
+                log("Aborting sequence.")
+                encoder.enable()  # Re-enable encoder
+                continue
+
+            # Wait for Blue Button Press
+            log("Waiting for blue button press...")
+            if not wait_for_button_press(blue_button, cfg.timeout_duration):
+                log("Blue button not pressed in time. Resetting system.")
+                transfer_fuel(transfer_valve_relay, cfg.transfer_sleep)
+                leds_off(led_mask)
+                encoder.pulse_count = 0
+                log("Aborting sequence.")
+                encoder.enable()  # Re-enable encoder
+                continue
+
+            # Transfer Fuel (red button aborts mid-transfer)
+            log("Transferring fuel...")
+            if not transfer_fuel(transfer_valve_relay, cfg.transfer_sleep, abort_button=red_button):
+                log("Emergency stop during fuel transfer. Resetting system.")
+                leds_off(led_mask)
+                encoder.pulse_count = 0
+                log("Aborting sequence.")
+                encoder.enable()  # Re-enable encoder
+                continue
+
+            # Wait for Red Button Press
+            log("Waiting for red button press...")
+            if not wait_for_button_press(red_button, cfg.timeout_duration):
+                log("Red button not pressed in time. Aborting sequence.")
+                leds_off(led_mask)
+                encoder.pulse_count = 0
+                encoder.enable()  # Re-enable encoder
+                continue
+
+            # Fire Rocket
+            log("Firing rocket...")
+            fire_rocket(fire_valve_relay, cfg.fire_duration)
+
+            log("Sequence completed. Resetting system.\n")
+
+            # Turn off all LEDs and reset encoder
+            leds_off(led_mask)
+            encoder.pulse_count = 0
+
+            # Cooldown before the next sequence: the encoder is disabled
+            # and nothing is polled, so halt the core with lightsleep
+            # instead of spinning in time.sleep. Drain the log first —
+            # the UART is no help while the clocks are stopped.
+            flush_log()
+            lightsleep(int(cfg.cooldown_duration * 1000))
+
+            # Re-enable encoder
+            encoder.enable()
+
+        # Idle tail: drain any queued log lines, then back off the CPU
+        flush_log()
+        time.sleep(0.2)